@@ -14,41 +14,167 @@ v4.4.1 版本特性 (基于 v4.4.0):
 """
 import sys
 import os
+import codecs
 import signal
+import socket
+import time
+import stat
+import threading
+import collections
+import functools
+import itertools
+import weakref
 import concurrent.futures
 import random
-import glob
+import shutil
+import tempfile
+import wave
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout
-from PyQt5.QtCore import (Qt, QTimer, QPoint, QPropertyAnimation, pyqtSignal, QBuffer,
-                          QIODevice, QParallelAnimationGroup, QAbstractAnimation, QEasingCurve, QUrl)
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
-from PyQt5.QtGui import QFont, QPainter, QColor, QPen, QFontDatabase, QCursor
+from PyQt5.QtCore import (Qt, QTimer, QPoint, QPropertyAnimation, pyqtSignal,
+                          QEasingCurve, QUrl, QSocketNotifier)
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QSoundEffect, QAudioDecoder, QAudioFormat
+from PyQt5.QtGui import QFont, QPainter, QColor, QPen, QFontDatabase, QCursor, QPixmap
 
 
-# --- 文件大小计算函数 (v4.2.1, 无改动) ---
-def _get_path_size(path):
+# 已由文本/图片/文件分支处理的常见 MIME 类型, 在 "未知内容" 分支中跳过
+_KNOWN_MIME_FORMATS = frozenset({
+    'text/plain', 'text/plain;charset=utf-8', 'text/uri-list', 'UTF8_STRING',
+    'COMPOUND_TEXT', 'TEXT', 'STRING', 'image/png',
+})
+
+# format_size 的单位格式表，按 1024 的幂次索引 (b, K, Mb, Gb)
+_SIZE_UNIT_FORMATS = ("%.0f <i>b</i>", "%.0f <i>K</i>", "%.1f <i>Mb</i>", "%.0f <i>Gb</i>")
+
+
+# --- 文件大小计算函数 (按目录拆分任务, 供线程池并行遍历) ---
+def _scan_one_dir(path, cancel_event=None):
+    """
+    扫描单个目录的直接子项，返回 (本层文件总字节数, 子目录路径列表)。
+    若传入的是文件，则直接返回其大小和空列表。
+    cancel_event 被置位时 (弹窗已关闭) 提前返回已统计的部分结果。
+    """
+    # 循环内用到的全局属性预先绑定为局部变量，每个条目省去多次属性查找
+    is_regular = stat.S_ISREG
+    is_cancelled = cancel_event.is_set if cancel_event is not None else None
+    files_size = 0
+    subdirs = []
+    add_subdir = subdirs.append
     try:
-        if os.path.isfile(path):
-            return os.path.getsize(path)
-        elif os.path.isdir(path):
-            total_size = 0
-            try:
-                with os.scandir(path) as entries:
-                    for entry in entries:
-                        try:
-                            if entry.is_file(follow_symlinks=False):
-                                total_size += entry.stat(follow_symlinks=False).st_size
-                            elif entry.is_dir(follow_symlinks=False):
-                                total_size += _get_path_size(entry.path)
-                        except (OSError, PermissionError):
-                            continue
-            except (OSError, PermissionError):
-                pass
-            return total_size
-        else:
-            return 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if is_cancelled is not None and is_cancelled():
+                    break
+                try:
+                    # is_dir/is_symlink 直接读取 readdir 返回的 d_type, 目录与符号链接无需任何 stat
+                    # (符号链接不跟随也不计入大小，避免循环)；其余条目只 lstat 一次
+                    if entry.is_dir(follow_symlinks=False):
+                        add_subdir(entry.path)
+                        continue
+                    if entry.is_symlink():
+                        continue
+                    info = entry.stat(follow_symlinks=False)
+                    if is_regular(info.st_mode):
+                        files_size += info.st_size
+                except (OSError, PermissionError):
+                    continue
+    except NotADirectoryError:
+        try:
+            files_size = os.path.getsize(path)
+        except (OSError, PermissionError):
+            pass
     except (OSError, PermissionError):
+        pass
+    return files_size, subdirs
+
+
+def _get_path_size(path, cancel_event=None):
+    """
+    同步计算路径总大小。
+    单函数显式栈实现: 每个目录在循环内直接遍历，不产生逐层函数调用，也不会触发 RecursionError。
+    """
+    # 根路径只 stat 一次: 文件直接返回大小，不再先尝试 scandir 失败后再 getsize
+    try:
+        root_stat = os.stat(path)
+    except (OSError, PermissionError):
+        return 0
+    if stat.S_ISREG(root_stat.st_mode):
+        return root_stat.st_size
+    if not stat.S_ISDIR(root_stat.st_mode):
+        return 0
+
+    scandir = os.scandir
+    is_regular = stat.S_ISREG
+    total_size = 0
+    stack = collections.deque([path])
+    push, pop = stack.append, stack.pop
+    while stack:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        current = pop()
+        try:
+            with scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            push(entry.path)
+                            continue
+                        if entry.is_symlink():
+                            continue
+                        info = entry.stat(follow_symlinks=False)
+                        if is_regular(info.st_mode):
+                            total_size += info.st_size
+                    except (OSError, PermissionError):
+                        continue
+        except (OSError, PermissionError):
+            continue
+    return total_size
+
+
+def _sum_paths(paths, cancel_event=None):
+    """在同一个任务中依次计算多个路径的总大小。"""
+    return sum(_get_path_size(path, cancel_event) for path in paths)
+
+
+def _classify_path(path):
+    """
+    对路径执行一次 os.stat 并分类，返回 ('file' | 'dir' | 'other', stat_result)；
+    路径不存在或无法访问时返回 None。
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if stat.S_ISREG(st.st_mode):
+        return 'file', st
+    if stat.S_ISDIR(st.st_mode):
+        return 'dir', st
+    return 'other', st
+
+
+def _estimate_text_size(text, sample_chars=4096):
+    """
+    按文本开头的抽样估算 GBK 字节数 (ASCII 计 1 字节，其余计 2 字节)，O(sample_chars)。
+    仅用于精确结果算出之前的即时显示。
+    """
+    if not text:
         return 0
+    sample = text[:sample_chars]
+    sample_bytes = len(sample) + sum(1 for c in sample if not c.isascii())
+    return round(sample_bytes * len(text) / len(sample))
+
+
+def _get_text_size(text, chunk_size=64 * 1024):
+    """
+    计算文本按 GBK 编码的字节数 (含 GBK 无法编码的字符时退回 UTF-8)。
+    使用增量编码器分块编码，峰值内存只与 chunk_size 相关，而不会复制整段文本。
+    """
+    for encoding, errors in (('gbk', 'strict'), ('utf-8', 'replace')):
+        encoder = codecs.getincrementalencoder(encoding)(errors)
+        try:
+            return sum(len(encoder.encode(text[i:i + chunk_size])) for i in range(0, len(text), chunk_size))
+        except UnicodeEncodeError:
+            continue
+    return 0
 # --- 文件大小计算函数结束 ---
 
 
@@ -56,31 +182,78 @@ class ClipboardMonitor(QApplication):
     """
     主应用程序类，处理剪贴板监控并管理弹窗。
     """
-    calculation_done = pyqtSignal(str, QWidget)
+    calculation_done = pyqtSignal(int, str)
+    calculation_progress = pyqtSignal(int, str)
     current_color_mode = 0
-    COOLDOWN_TIME_MS = 100
+    DEBOUNCE_TIME_MS = 80
+    MAX_DISPLAY_TEXT_CHARS = 4096
+    SCAN_FANOUT_DEPTH = 3
+    PROGRESS_INTERVAL_S = 0.2
+    # 目录扫描受磁盘 IO 限制，2~4 个线程即可占满同一个卷；更多线程只会在 GIL 和卷锁上互相争用
+    SIZE_WORKERS = 4
+    SIZE_CACHE_MAX = 256
+    SIZE_CACHE_TTL_S = 60
+    MAX_SYNC_STAT_PATHS = 32
 
     def __init__(self, argv):
         super().__init__(argv)
-        self.active_popups = []
-        self.is_on_cooldown = False
+        self.active_popups = {}  # id(popup) -> popup，按创建顺序排列
+        # 大小计算只在线程间传递整数 id，主线程再通过弱引用找回对应的弹窗
+        self._calc_ids = itertools.count()
+        self._pending_calculations = {}
         self.calculation_done.connect(self.on_calculation_finished)
+        self.calculation_progress.connect(self.on_calculation_progress)
+
+        # 合并短时间内连续的 dataChanged: 每次变化都重新计时，只处理一串变化中的最后一次
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_TIME_MS)
+        self._debounce_timer.timeout.connect(self.process_pending_clipboard)
         self.setup_clipboard_monitor()
 
-        self.executor = concurrent.futures.ThreadPoolExecutor(
-            max_workers=os.cpu_count() * 2 if os.cpu_count() else 8
-        )
+        # 线程池在第一次需要后台计算时才创建 (见 get_executor)，多数会话只复制文本和单个文件
+        self.executor = None
+
+        self._size_cache = collections.OrderedDict()
+        self._size_cache_lock = threading.Lock()
+        self.aboutToQuit.connect(self.shutdown_executor)
+        self.aboutToQuit.connect(self.cleanup_sound_effects)
 
-        self.active_players = []
-        self.last_played_sound = None
+        self.last_sound_index = None
         self.setup_sound_files()
 
+        self._cached_screen = self.primaryScreen()
+        self.screenAdded.connect(self.invalidate_cached_screen)
+        self.screenRemoved.connect(self.invalidate_cached_screen)
+        self.primaryScreenChanged.connect(self.invalidate_cached_screen)
+
+    def invalidate_cached_screen(self, *_):
+        """屏幕增减或主屏变化时清空缓存，下次弹窗时重新定位。"""
+        self._cached_screen = None
+
+    def get_screen_for_cursor(self):
+        """
+        返回鼠标指针所在的屏幕。
+        仅当指针移出缓存屏幕的范围时才调用 screenAt (在 X11 多屏下可能需要与窗口服务器往返)。
+        """
+        cursor_pos = QCursor.pos()
+        if self._cached_screen is None or not self._cached_screen.geometry().contains(cursor_pos):
+            self._cached_screen = self.screenAt(cursor_pos) or self.primaryScreen()
+        return self._cached_screen
+
     def setup_sound_files(self):
-        """查找并加载音效文件列表。"""
+        """查找音效文件，并为每个文件预热一个常驻的 QMediaPlayer。"""
+        self.player_pool = []
         try:
             script_dir = os.path.dirname(os.path.realpath(__file__))
             assets_dir = os.path.join(script_dir, 'assets')
-            self.sound_files = glob.glob(os.path.join(assets_dir, '[1-8].mp3'))
+            sound_names = {f"{i}.mp3" for i in range(1, 9)}
+            try:
+                with os.scandir(assets_dir) as entries:
+                    self.sound_files = sorted(entry.path for entry in entries
+                                              if entry.name in sound_names and entry.is_file())
+            except FileNotFoundError:
+                self.sound_files = []
 
             if not self.sound_files:
                 print("警告: 在 'assets' 文件夹中未找到任何 mp3 音效文件。")
@@ -90,38 +263,138 @@ class ClipboardMonitor(QApplication):
             print(f"加载音效文件时出错: {e}")
             self.sound_files = []
 
-    def play_random_sound(self):
-        """从列表中随机选择并播放一个音效。"""
+        # 启动时一次性 setMedia，让后端提前完成解码器初始化，播放时只需 play()
+        for sound_path in self.sound_files:
+            player = QMediaPlayer(self)
+            player.setMedia(QMediaContent(QUrl.fromLocalFile(sound_path)))
+            self.player_pool.append(player)
+
+        self.setup_sound_effects()
+
+    def setup_sound_effects(self):
+        """
+        在后台把每个 mp3 解码为 16 位 PCM 并写成临时 WAV，完成后改用低延迟的 QSoundEffect 播放。
+        解码完成前或解码失败 (平台不支持 QAudioDecoder 等) 时，继续使用 player_pool 中的 QMediaPlayer。
+        """
+        self.sound_effects = {}
+        self._sound_decoders = {}
+        self._sound_wav_dir = None
         if not self.sound_files:
             return
+        try:
+            self._sound_wav_dir = tempfile.mkdtemp(prefix="kopy-sounds-")
+        except OSError as e:
+            print(f"创建音效缓存目录时出错: {e}")
+            return
+
+        pcm_format = QAudioFormat()
+        pcm_format.setCodec("audio/pcm")
+        pcm_format.setSampleRate(44100)
+        pcm_format.setChannelCount(2)
+        pcm_format.setSampleSize(16)
+        pcm_format.setSampleType(QAudioFormat.SignedInt)
+        pcm_format.setByteOrder(QAudioFormat.LittleEndian)
+
+        for index, sound_path in enumerate(self.sound_files):
+            decoder = QAudioDecoder(self)
+            decoder.setAudioFormat(pcm_format)
+            decoder.setSourceFilename(sound_path)
+            chunks = []
+            decoder.bufferReady.connect(lambda i=index, d=decoder, c=chunks: self.on_sound_buffer_ready(i, d, c))
+            decoder.finished.connect(lambda i=index, c=chunks: self.on_sound_decoded(i, c))
+            decoder.error.connect(lambda _, i=index: self.release_sound_decoder(i, "解码失败"))
+            self._sound_decoders[index] = decoder
+            decoder.start()
+
+    def on_sound_buffer_ready(self, index, decoder, chunks):
+        """收集解码出的 PCM 数据；后端无法输出 16 位有符号整数时放弃该文件。"""
+        buffer = decoder.read()
+        buffer_format = buffer.format()
+        if buffer_format.sampleSize() != 16 or buffer_format.sampleType() != QAudioFormat.SignedInt:
+            # stop() 不会发出 finished，需要在这里自行释放解码器
+            decoder.stop()
+            chunks.clear()
+            self.release_sound_decoder(index, "解码格式不受支持")
+            return
+        if not chunks:
+            chunks.append((buffer_format.sampleRate(), buffer_format.channelCount()))
+        chunks.append(buffer.constData().asstring(buffer.byteCount()))
 
-        candidate_files = self.sound_files
-        if self.last_played_sound and len(self.sound_files) > 1:
-            candidate_files = [f for f in self.sound_files if f != self.last_played_sound]
-            if not candidate_files:
-                candidate_files = self.sound_files
+    def release_sound_decoder(self, index, reason=None):
+        """
+        释放指定音效的解码器 (可重复调用)。reason 不为空时表示解码失败，打印一行警告，
+        该音效继续由 player_pool 中的 QMediaPlayer 播放。
+        """
+        decoder = self._sound_decoders.pop(index, None)
+        if decoder is None:
+            return
+        decoder.deleteLater()
+        if reason:
+            print(f"警告: 音效 {os.path.basename(self.sound_files[index])} {reason}，将使用 QMediaPlayer 播放。")
+
+    def on_sound_decoded(self, index, chunks):
+        """解码完成: 写出 WAV 并创建对应的 QSoundEffect。"""
+        self.release_sound_decoder(index)
+        if len(chunks) < 2:
+            return
+        sample_rate, channel_count = chunks[0]
+        wav_path = os.path.join(self._sound_wav_dir, f"{index}.wav")
+        try:
+            with wave.open(wav_path, 'wb') as wav_file:
+                wav_file.setnchannels(channel_count)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(sample_rate)
+                wav_file.writeframes(b"".join(chunks[1:]))
+        except (OSError, wave.Error) as e:
+            print(f"写入音效缓存时出错: {e}")
+            return
+        effect = QSoundEffect(self)
+        effect.statusChanged.connect(functools.partial(self.on_sound_effect_status_changed, index))
+        effect.setSource(QUrl.fromLocalFile(wav_path))
+        self.sound_effects[index] = effect
+
+    def on_sound_effect_status_changed(self, index):
+        """QSoundEffect 就绪后释放对应的备用 QMediaPlayer，不再让其媒体管线常驻。"""
+        effect = self.sound_effects.get(index)
+        player = self.player_pool[index]
+        if effect is None or player is None or effect.status() != QSoundEffect.Ready:
+            return
+        self.player_pool[index] = None
+        player.stop()
+        player.setMedia(QMediaContent())
+        player.deleteLater()
 
-        sound_path = random.choice(candidate_files)
-        self.last_played_sound = sound_path
+    def cleanup_sound_effects(self):
+        """应用退出时删除解码出的临时 WAV 文件。"""
+        if self._sound_wav_dir:
+            shutil.rmtree(self._sound_wav_dir, ignore_errors=True)
 
-        player = QMediaPlayer()
-        url = QUrl.fromLocalFile(sound_path)
-        self.active_players.append(player)
-        player.mediaStatusChanged.connect(self.on_player_status_changed)
-        player.setMedia(QMediaContent(url))
-        player.play()
+    def play_random_sound(self):
+        """随机选择一个音效 (避免与上一次重复) 并播放，优先使用已就绪的 QSoundEffect。"""
+        if not self.player_pool:
+            return
 
-    def on_player_status_changed(self, status):
-        """播放器状态改变时的槽函数。"""
-        if status == QMediaPlayer.EndOfMedia:
-            player = self.sender()
-            if player in self.active_players:
-                self.active_players.remove(player)
-            if player:
-                try:
-                    player.disconnect()
-                except RuntimeError:
-                    pass
+        # 在除上一次之外的 n-1 个下标中均匀抽取，不必每次构建候选列表
+        sound_count = len(self.player_pool)
+        if sound_count == 1 or self.last_sound_index is None:
+            index = random.randrange(sound_count)
+        else:
+            index = random.randrange(sound_count - 1)
+            if index >= self.last_sound_index:
+                index += 1
+        self.last_sound_index = index
+
+        effect = self.sound_effects.get(index)
+        if effect is not None and effect.status() == QSoundEffect.Ready:
+            effect.play()
+            return
+
+        player = self.player_pool[index]
+        if player is None:
+            return
+        player.stop()
+        player.setPosition(0)
+        player.play()
 
     def setup_clipboard_monitor(self):
         """设置剪贴板监控机制。"""
@@ -135,16 +408,47 @@ class ClipboardMonitor(QApplication):
         (v4.4.1 修改: 修复bug, 计算未知内容大小, 优化UI显示)
         """
         all_formats = mime_data.formats()
+        # 直接根据已取得的格式列表判断类型，避免 hasUrls/hasImage/hasText 各自再查询一次 (X11 下可能触发选区往返)
+        has_urls = 'text/uri-list' in all_formats
+        # Qt 只在某种图片格式可以解码时才列出 application/x-qt-image，这正是 hasImage() 的判断依据
+        has_image = 'application/x-qt-image' in all_formats
+        has_text = any(f.startswith('text/') for f in all_formats)
 
         # 1. 优先处理已知类型 (文件, 图片, 文本)
-        if mime_data.hasUrls():
+        if has_urls:
             urls = mime_data.urls()
             if not urls: return None
 
-            local_paths = [url.toLocalFile() for url in urls if url.isLocalFile() and os.path.exists(url.toLocalFile())]
+            # 单次遍历 URL: 区分本地/远程、收集前几个显示名，并对每个本地路径只 stat 一次，
+            # 同时统计文件/文件夹数与文件总大小；stat 结果随数据传给大小计算复用。
+            # QUrl.toLocalFile 在所有平台都使用 '/' 分隔。
+            # URL 数量超过 MAX_SYNC_STAT_PATHS 时 (例如从网络位置拖拽) 主线程不做任何 stat，
+            # 不存在的路径在后台扫描中按 0 字节处理
+            max_display_files = 7
+            stat_inline = len(urls) <= self.MAX_SYNC_STAT_PATHS
+            local_paths = []
+            remote_urls = []
+            display_names = []
+            path_stats = {}
+            num_files = num_folders = file_bytes = 0
+            for url in urls:
+                if not url.isLocalFile():
+                    remote_urls.append(url)
+                    continue
+                p = url.toLocalFile()
+                local_paths.append(p)
+                if len(display_names) < max_display_files:
+                    display_names.append(p.rpartition('/')[2])
+                if not stat_inline: continue
+                classified = _classify_path(p)
+                path_stats[p] = classified
+                if classified is None: continue
+                if classified[0] == 'file':
+                    num_files += 1
+                    file_bytes += classified[1].st_size
+                elif classified[0] == 'dir': num_folders += 1
 
             if not local_paths:
-                remote_urls = [url for url in urls if not url.isLocalFile()]
                 if remote_urls:
                     top_text = f"复制了 {len(remote_urls)} 个 URL"
                     bottom_text = remote_urls[0].toString()
@@ -154,48 +458,64 @@ class ClipboardMonitor(QApplication):
                 return None
 
             count = len(local_paths)
-            num_files = sum(1 for p in local_paths if os.path.isfile(p))
-            num_folders = sum(1 for p in local_paths if os.path.isdir(p))
+            if not stat_inline:
+                if count > max_display_files:
+                    display_names.append(f"... (等 {count - max_display_files} 个)")
+                return {"type": "file", "top_text": "\n".join(display_names),
+                        "bottom_template": f"{count} 个项目: {{}}", "paths": local_paths}
 
             top_text = ""
             bottom_template = ""
             if count == 1:
-                top_text = os.path.basename(local_paths[0])
+                top_text = display_names[0]
                 if num_folders == 1: bottom_template = "文件夹: {}"
-                else: bottom_template = "文件: {}"
+                else:
+                    # 单个文件: 在主线程直接 stat 一次，比提交到线程池再回传信号更快
+                    classified = path_stats[local_paths[0]]
+                    byte_size = classified[1].st_size if classified is not None else None
+                    return {"type": "file", "top_text": top_text, "bottom_text": f"文件: {self.format_size(byte_size)}"}
             else:
-                max_display_files = 7
-                top_text_lines = [os.path.basename(p) for p in local_paths[:max_display_files]]
                 if count > max_display_files:
-                    top_text_lines.append(f"... (等 {count - max_display_files} 个)")
-                top_text = "\n".join(top_text_lines)
+                    display_names.append(f"... (等 {count - max_display_files} 个)")
+                top_text = "\n".join(display_names)
 
                 if num_files > 0 and num_folders > 0: bottom_template = f"{count} 个项目: {{}}"
                 elif num_folders > 0: bottom_template = f"{count} 个文件夹: {{}}"
-                else: bottom_template = f"{count} 个文件: {{}}"
-            return {"type": "file", "top_text": top_text, "bottom_template": bottom_template, "paths": local_paths}
-
-        if mime_data.hasImage():
+                else:
+                    # 没有文件夹时所有大小都已由 stat 得到，直接求和，无需提交到线程池
+                    bottom_template = f"{count} 个文件: {{}}"
+                    return {"type": "file", "top_text": top_text, "bottom_text": bottom_template.format(self.format_size(file_bytes))}
+            return {"type": "file", "top_text": top_text, "bottom_template": bottom_template,
+                    "paths": local_paths, "path_stats": path_stats}
+
+        if has_image:
             # 【v4.4.1 BUG修复】: 使用 self.clipboard() 代替未定义的 clipboard
-            pixmap = self.clipboard().pixmap()
-            if pixmap.isNull(): return None
-            buffer = QBuffer()
-            buffer.open(QIODevice.WriteOnly); pixmap.save(buffer, "PNG"); byte_size = len(buffer.data())
-            return {"type": "image", "top_text": f"{pixmap.width()}×{pixmap.height()}", "bottom_text": f"截图: {self.format_size(byte_size)}"}
-
-        if mime_data.hasText():
+            # 直接取像素缓冲区大小，不再为了显示字节数而做一次 PNG 编码
+            # 图片解码失败时不直接放弃，继续按文本或未知内容处理
+            image = self.clipboard().image()
+            if not image.isNull():
+                byte_size = image.sizeInBytes() if hasattr(image, 'sizeInBytes') else image.bytesPerLine() * image.height()
+                return {"type": "image", "top_text": f"{image.width()}×{image.height()}", "bottom_text": f"截图: {self.format_size(byte_size)}"}
+
+        if has_text:
             text = mime_data.text()
             if text:
-                try: byte_size = len(text.encode('gbk'))
-                except UnicodeEncodeError: byte_size = len(text.encode('utf-8', 'replace'))
-                return {"type": "text", "top_text": text, "bottom_text": f"{self.format_size(byte_size)}"}
+                # 弹窗只能显示几十行，截断后再交给 QLabel，避免对超长文本做完整的换行排版
+                display_text = text
+                if len(text) > self.MAX_DISPLAY_TEXT_CHARS:
+                    display_text = text[:self.MAX_DISPLAY_TEXT_CHARS] + "\n…"
+                    # 大段文本的精确编码计数放到线程池中进行，弹窗先显示按抽样估算的大小
+                    estimate = self.format_size(_estimate_text_size(text))
+                    return {"type": "text", "top_text": display_text, "bottom_text": f"{estimate} ●", "pending_text": text}
+                byte_size = _get_text_size(text)
+                return {"type": "text", "top_text": display_text, "bottom_text": f"{self.format_size(byte_size)}"}
 
         # 2. 【v4.4.1 功能增强】处理 "未知" 但 "非空" 的剪贴板, 并计算其大小
         if all_formats:
             filtered_formats = [
                 f for f in all_formats
                 if not f.startswith('application/x-qt-')
-                and f not in ('text/plain', 'text/plain;charset=utf-8', 'text/uri-list', 'UTF8_STRING', 'COMPOUND_TEXT', 'TEXT', 'STRING', 'image/png')
+                and f not in _KNOWN_MIME_FORMATS
             ]
 
             primary_type = None
@@ -222,41 +542,205 @@ class ClipboardMonitor(QApplication):
         return None
     # --- 核心修改结束 ---
 
-    def calculate_total_size_async(self, file_paths, popup, template):
-        """在后台线程中异步计算所有给定文件和文件夹的总大小。"""
-        futures = [self.executor.submit(_get_path_size, path) for path in file_paths]
+    def lookup_cached_size(self, key):
+        """
+        查询目录大小缓存，key 为 (路径, st_mtime_ns, st_ino)。
+        目录的 mtime 只反映直接子项的增删，深层文件的修改不会改变它，因此缓存只在 SIZE_CACHE_TTL_S 秒内有效，
+        用于覆盖 "短时间内反复复制同一个文件夹" 的场景。
+        """
+        with self._size_cache_lock:
+            entry = self._size_cache.get(key)
+            if entry is None:
+                return None
+            size, stored_at = entry
+            if time.monotonic() - stored_at > self.SIZE_CACHE_TTL_S:
+                del self._size_cache[key]
+                return None
+            self._size_cache.move_to_end(key)
+            return size
+
+    def store_cached_size(self, key, size):
+        """写入目录大小缓存 (可在工作线程中调用)，超过 SIZE_CACHE_MAX 时淘汰最久未使用的条目。"""
+        with self._size_cache_lock:
+            self._size_cache[key] = (size, time.monotonic())
+            self._size_cache.move_to_end(key)
+            while len(self._size_cache) > self.SIZE_CACHE_MAX:
+                self._size_cache.popitem(last=False)
+
+    def get_executor(self):
+        """返回后台计算用的线程池，首次调用时创建 (只在主线程调用)。"""
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.SIZE_WORKERS,
+                thread_name_prefix="kopy-size"
+            )
+        return self.executor
+
+    def register_calculation(self, popup):
+        """
+        为弹窗登记一个后台计算，返回 (calc_id, cancel_event)。
+        线程间只传递 calc_id；cancel_event 在弹窗关闭时由 close_popup 置位，后台任务随即停止。
+        """
+        calc_id = next(self._calc_ids)
+        self._pending_calculations[calc_id] = weakref.ref(popup)
+        cancel_event = threading.Event()
+        popup.size_calc_id = calc_id
+        popup.size_cancel_event = cancel_event
+        return calc_id, cancel_event
+
+    def calculate_text_size_async(self, text, popup):
+        """在后台线程池中计算大段文本的编码字节数，完成后更新弹窗的底部标签。"""
+        calc_id, _ = self.register_calculation(popup)
+
+        def on_text_size_done(future):
+            if future.cancelled():
+                return
+            try:
+                byte_size = future.result()
+            except Exception as exc:
+                sys.stderr.write(f"警告: 计算文本大小时发生错误: {exc}\n")
+                byte_size = None
+            self.calculation_done.emit(calc_id, self.format_size(byte_size))
 
-        def aggregate_and_emit_result_on_main_thread(futures_list):
-            total_size = 0
-            for future in futures_list:
-                try:
-                    total_size += future.result()
-                except Exception as exc:
-                    sys.stderr.write(f"警告: 聚合大小计算时发生错误: {exc}\n")
-            self.calculation_done.emit(template.format(self.format_size(total_size)), popup)
+        try:
+            self.get_executor().submit(_get_text_size, text).add_done_callback(on_text_size_done)
+        except RuntimeError:
+            pass
+
+    def calculate_total_size_async(self, file_paths, popup, template, path_stats=None):
+        """
+        在后台线程池中异步计算所有给定文件和文件夹的总大小。
+        每个子目录作为独立任务提交，即使只复制了一个大文件夹，也能让所有工作线程并行扫描。
+        path_stats 为 _classify_path 的结果缓存: 已知的文件直接累加大小，已知不存在的路径跳过，只有目录需要扫描；
+        目录若在大小缓存中命中 (见 lookup_cached_size) 也不再扫描。
+        """
+        known_size = 0
+        scan_paths = []
+        cache_keys = {}  # 需要扫描且可缓存的根目录 -> 缓存键
+        for path in file_paths:
+            if path_stats is None or path not in path_stats:
+                scan_paths.append(path)
+                continue
+            classified = path_stats[path]
+            if classified is None: continue
+            if classified[0] == 'dir':
+                key = (path, classified[1].st_mtime_ns, classified[1].st_ino)
+                cached_size = self.lookup_cached_size(key)
+                if cached_size is not None:
+                    known_size += cached_size
+                else:
+                    cache_keys[path] = key
+                    scan_paths.append(path)
+            elif classified[0] == 'file': known_size += classified[1].st_size
+
+        executor = self.get_executor()
+        calc_id, cancel_event = self.register_calculation(popup)
+        lock = threading.Lock()
+        state = {"pending": len(scan_paths), "total": known_size, "last_progress": time.monotonic()}
+        # 每个可缓存根目录各自的未完成任务数与累计大小，根目录扫描完成后写入大小缓存
+        root_states = {path: {"pending": 1, "total": 0} for path in cache_keys}
+
+        def emit_result():
+            self.calculation_done.emit(calc_id, template.format(self.format_size(state["total"])))
+
+        def submit_scan(path, depth, root):
+            # 浅层目录逐个拆分为任务以便并行；超过 SCAN_FANOUT_DEPTH 的子树在单个任务内整体计算，避免任务数爆炸
+            if cancel_event.is_set():
+                return
+            try:
+                if depth < self.SCAN_FANOUT_DEPTH:
+                    future = executor.submit(_scan_one_dir, path, cancel_event)
+                else:
+                    future = executor.submit(_get_path_size, path, cancel_event)
+                future.add_done_callback(functools.partial(on_scan_done, depth=depth, root=root))
+            except RuntimeError:
+                # 线程池已关闭 (应用退出中)，放弃剩余任务
+                pass
 
-        self.executor.submit(aggregate_and_emit_result_on_main_thread, futures)
+        def on_scan_done(future, depth, root):
+            if future.cancelled() or cancel_event.is_set():
+                # 应用退出时被 shutdown_executor 取消，或弹窗已关闭
+                return
+            try:
+                result = future.result()
+                files_size, subdirs = result if isinstance(result, tuple) else (result, [])
+            except Exception as exc:
+                sys.stderr.write(f"警告: 聚合大小计算时发生错误: {exc}\n")
+                files_size, subdirs = 0, []
+            completed_root = None
+            with lock:
+                state["total"] += files_size
+                state["pending"] += len(subdirs) - 1
+                finished = state["pending"] == 0
+                if root in root_states:
+                    root_state = root_states[root]
+                    root_state["total"] += files_size
+                    root_state["pending"] += len(subdirs) - 1
+                    if root_state["pending"] == 0:
+                        completed_root = (cache_keys[root], root_state["total"])
+                now = time.monotonic()
+                if not finished and now - state["last_progress"] >= self.PROGRESS_INTERVAL_S:
+                    # 在锁内发出进度，保证它先于最终结果进入主线程的事件队列
+                    state["last_progress"] = now
+                    self.calculation_progress.emit(calc_id, template.format(f"{self.format_size(state['total'])} ●"))
+            if completed_root is not None:
+                self.store_cached_size(*completed_root)
+            for subdir in subdirs:
+                submit_scan(subdir, depth + 1, root)
+            if finished:
+                emit_result()
+
+        if not scan_paths:
+            emit_result()
+            return
 
-    def on_calculation_finished(self, final_text, popup):
-        """当大小计算完成时，在主线程中更新弹窗的底部标签。"""
-        if popup in self.active_popups:
+        if len(scan_paths) >= self.SIZE_WORKERS:
+            # 顶层目录已足够填满线程池: 按块批量提交，每块在单个任务内整体计算，摊薄任务调度开销
+            chunk_size = max(1, len(scan_paths) // (4 * self.SIZE_WORKERS))
+            chunks = [scan_paths[i:i + chunk_size] for i in range(0, len(scan_paths), chunk_size)]
+            state["pending"] = len(chunks)
+            for chunk in chunks:
+                # 只有单个根目录的块才能把结果写入大小缓存
+                root = chunk[0] if len(chunk) == 1 else None
+                try:
+                    executor.submit(_sum_paths, chunk, cancel_event).add_done_callback(
+                        functools.partial(on_scan_done, depth=self.SCAN_FANOUT_DEPTH, root=root))
+                except RuntimeError:
+                    return
+            return
+
+        for path in scan_paths:
+            submit_scan(path, 0, path)
+
+    def on_calculation_progress(self, calc_id, partial_text):
+        """大小计算进行中，在主线程中用已累计的大小更新弹窗的底部标签。"""
+        popup_ref = self._pending_calculations.get(calc_id)
+        popup = popup_ref() if popup_ref is not None else None
+        if popup is not None and id(popup) in self.active_popups:
+            popup.update_bottom_text(partial_text)
+
+    def on_calculation_finished(self, calc_id, final_text):
+        """当大小计算完成时，在主线程中更新弹窗的底部标签 (弹窗已关闭则忽略)。"""
+        popup_ref = self._pending_calculations.pop(calc_id, None)
+        popup = popup_ref() if popup_ref is not None else None
+        if popup is not None and id(popup) in self.active_popups:
             popup.update_bottom_text(final_text)
 
     def format_size(self, size_bytes):
-        """格式化文件大小显示。"""
+        """格式化文件大小显示 (按 bit_length 直接查表确定单位)。"""
         if size_bytes is None: return "N/A"
-        if size_bytes < 1024: return f"{round(size_bytes)} <i>b</i>"
-        kb = size_bytes / 1024
-        if kb < 1024: return f"{round(kb)} <i>K</i>"
-        mb = kb / 1024
-        return f"{mb:.1f} <i>Mb</i>" if mb < 1024 else f"{round(mb/1024)} <i>Gb</i>"
+        size_bytes = int(size_bytes)
+        if size_bytes < 1024: return f"{size_bytes} <i>b</i>"
+        unit_index = min((size_bytes.bit_length() - 1) // 10, 3)
+        return _SIZE_UNIT_FORMATS[unit_index] % (size_bytes / (1 << (unit_index * 10)))
 
 
     def on_clipboard_changed(self):
-        """剪贴板变化的主要事件处理程序。"""
-        if self.is_on_cooldown:
-            return
+        """剪贴板变化时只重启防抖定时器，实际处理推迟到 process_pending_clipboard。"""
+        self._debounce_timer.start()
 
+    def process_pending_clipboard(self):
+        """防抖结束后处理剪贴板的最新内容。"""
         data = self.process_clipboard_data(self.clipboard().mimeData())
 
         if data:
@@ -267,15 +751,19 @@ class ClipboardMonitor(QApplication):
 
             if data.get("type") == "file" and "paths" in data:
                 new_popup.update_bottom_text(data["bottom_template"].format("●"))
-                self.calculate_total_size_async(data["paths"], new_popup, data["bottom_template"])
+                self.calculate_total_size_async(data["paths"], new_popup, data["bottom_template"], data.get("path_stats"))
+            elif "pending_text" in data:
+                self.calculate_text_size_async(data["pending_text"], new_popup)
 
     def show_popup(self, data):
         """创建并显示一个新的弹窗。"""
         stationary_popup = None
-        for p in self.active_popups:
-            if not (hasattr(p, 'is_sliding_out') and p.is_sliding_out):
+        for p in list(self.active_popups.values()):
+            if hasattr(p, 'is_sliding_out') and p.is_sliding_out:
+                # 连续复制时，上一轮仍在滑出的弹窗直接关闭，同一时刻最多只有一组滑出动画在运行
+                self.close_popup(p)
+            elif stationary_popup is None:
                 stationary_popup = p
-                break
 
         if stationary_popup:
             stationary_popup.slide_out()
@@ -283,36 +771,42 @@ class ClipboardMonitor(QApplication):
         new_popup = TransparentPopup(data, self, self.current_color_mode)
         self.current_color_mode = 1 - self.current_color_mode
         new_popup.raise_()
-        self.active_popups.append(new_popup)
-
-        self.is_on_cooldown = True
-        QTimer.singleShot(self.COOLDOWN_TIME_MS, lambda: setattr(self, 'is_on_cooldown', False))
+        self.active_popups[id(new_popup)] = new_popup
 
         return new_popup
 
     def close_popup(self, popup):
         """关闭指定的弹窗，确保在关闭卡片时正确处理生命周期。"""
-        if popup in self.active_popups:
-            self.active_popups.remove(popup)
+        self.active_popups.pop(id(popup), None)
         try:
             if hasattr(popup, 'slide_anim') and popup.slide_anim.state() == QPropertyAnimation.Running:
                 popup.slide_anim.stop()
         except (RuntimeError, AttributeError):
             pass
         try:
-            if hasattr(popup, 'anim_group') and popup.anim_group.state() == QParallelAnimationGroup.Running:
-                popup.anim_group.stop()
+            if hasattr(popup, 'fade_anim') and popup.fade_anim.state() == QPropertyAnimation.Running:
+                popup.fade_anim.stop()
         except (RuntimeError, AttributeError):
             pass
 
         if hasattr(popup, 'lifecycle_timer'):
             popup.lifecycle_timer.stop()
+        if hasattr(popup, 'size_cancel_event'):
+            popup.size_cancel_event.set()
+            self._pending_calculations.pop(popup.size_calc_id, None)
         popup.close()
 
-    def __del__(self):
-        """确保在应用程序退出时关闭线程池。"""
-        if hasattr(self, 'executor') and self.executor:
-            self.executor.shutdown(wait=True)
+    def shutdown_executor(self):
+        """
+        应用退出时关闭线程池，取消尚未开始的任务，并通知正在运行的扫描立即停止。
+        (线程池的工作线程无法设为守护线程，解释器退出时仍会 join 它们，
+        因此必须让慢速挂载点上的扫描尽快返回，退出才不会被卡住。)
+        """
+        for popup in self.active_popups.values():
+            if hasattr(popup, 'size_cancel_event'):
+                popup.size_cancel_event.set()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
 
 
 class TransparentPopup(QWidget):
@@ -322,20 +816,35 @@ class TransparentPopup(QWidget):
     SLIDE_IN_DURATION = 88
     SLIDE_OUT_DURATION = 88
     LIFECYCLE_SECONDS = 19
+    # 两种配色: color_mode -> (背景色, 文字色, 边框色, 上方标签样式表, 下方标签样式表)
+    COLOR_SCHEMES = {
+        0: (QColor(0, 0, 0, 240), QColor(Qt.white), QColor(Qt.white),
+            "color: #ffffff;", "color: #cd853f;"),
+        1: (QColor(238, 232, 213, 250), QColor(55, 45, 15), QColor(55, 45, 15),
+            "color: rgb(55, 45, 15); font-weight: bold;", "color: #8B4513; font-weight: bold;"),
+    }
+    FONT_FALLBACK_LIST = ["Consolas", "monospace", "LXGW WenKai GB Screen", "SF Pro", "Segoe UI", "Aptos", "Roboto", "Arial"]
+    _shared_font = None
+    _background_cache = {}
+
+    @classmethod
+    def get_shared_font(cls):
+        """返回所有弹窗共用的 QFont (首次调用时构建；QFont 为隐式共享，可安全复用)。"""
+        if cls._shared_font is None:
+            font = QFont()
+            font.setFamilies(cls.FONT_FALLBACK_LIST)
+            font.setPointSize(11)
+            cls._shared_font = font
+        return cls._shared_font
 
     def __init__(self, data, monitor, color_mode=0):
         super().__init__()
         self.monitor = monitor
         self.color_mode = color_mode
 
-        if self.color_mode == 0:
-            self.background_color = QColor(0, 0, 0, 240)
-            self.text_color = Qt.white
-            self.border_color = Qt.white
-        else:
-            self.background_color = QColor(238, 232, 213, 250)
-            self.text_color = QColor(55, 45, 15)
-            self.border_color = QColor(55, 45, 15)
+        (self.background_color, self.text_color, self.border_color,
+         top_style_sheet, bottom_style_sheet) = self.COLOR_SCHEMES[self.color_mode]
+        self.border_pen = QPen(self.border_color, 1, Qt.DashLine)
 
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint | Qt.Tool | Qt.WindowDoesNotAcceptFocus)
         self.setAttribute(Qt.WA_TranslucentBackground); self.setAttribute(Qt.WA_ShowWithoutActivating)
@@ -343,25 +852,16 @@ class TransparentPopup(QWidget):
         self.setFixedSize(222, 222)
         layout = QVBoxLayout(self); layout.setContentsMargins(15, 15, 15, 15); layout.setSpacing(10)
 
-        font_fallback_list = ["Consolas", "monospace", "LXGW WenKai GB Screen", "SF Pro", "Segoe UI", "Aptos", "Roboto", "Arial"]
-        font = QFont()
-        font.setFamilies(font_fallback_list)
-        font.setPointSize(11)
+        font = self.get_shared_font()
 
         self.top_content_label = QLabel(data.get("top_text")); self.top_content_label.setFont(font)
         self.top_content_label.setTextFormat(Qt.PlainText)
-        if self.color_mode == 0:
-            self.top_content_label.setStyleSheet("color: #ffffff;")
-        else:
-            self.top_content_label.setStyleSheet(f"color: rgb({self.text_color.red()}, {self.text_color.green()}, {self.text_color.blue()}); font-weight: bold;")
+        self.top_content_label.setStyleSheet(top_style_sheet)
         self.top_content_label.setWordWrap(True)
         self.top_content_label.setAlignment(Qt.AlignTop | Qt.AlignLeft); self.top_content_label.setMaximumHeight(162)
 
         self.bottom_message_label = QLabel(data.get("bottom_text", "")); self.bottom_message_label.setFont(font)
-        if self.color_mode == 0:
-            self.bottom_message_label.setStyleSheet("color: #cd853f;")
-        else:
-            self.bottom_message_label.setStyleSheet("color: #8B4513; font-weight: bold;")
+        self.bottom_message_label.setStyleSheet(bottom_style_sheet)
         self.bottom_message_label.setAlignment(Qt.AlignBottom | Qt.AlignLeft)
         self.bottom_message_label.setTextFormat(Qt.RichText)
 
@@ -369,6 +869,7 @@ class TransparentPopup(QWidget):
 
         self.target_screen_geom = self.get_current_screen_geometry()
         self.move_to_initial_position()
+        self.setup_animations()
         self.show()
         self.slide_in()
         self.start_lifecycle()
@@ -379,41 +880,34 @@ class TransparentPopup(QWidget):
             self.slide_out()
 
     def get_current_screen_geometry(self):
-        """获取鼠标指针当前所在屏幕的可用几何区域。"""
-        current_screen = QApplication.screenAt(QCursor.pos())
-        if current_screen:
-            return current_screen.availableGeometry()
-        return QApplication.primaryScreen().availableGeometry()
+        """获取鼠标指针当前所在屏幕的可用几何区域 (屏幕对象由 ClipboardMonitor 缓存)。"""
+        return self.monitor.get_screen_for_cursor().availableGeometry()
 
     def start_lifecycle(self):
         self.lifecycle_timer = QTimer(self); self.lifecycle_timer.setSingleShot(True)
         self.lifecycle_timer.timeout.connect(self.slide_out); self.lifecycle_timer.start(self.LIFECYCLE_SECONDS * 1000)
 
+    def setup_animations(self):
+        """创建弹窗生命周期内复用的位移与淡出动画，滑入/滑出时只需重设起止值。"""
+        self.slide_anim = QPropertyAnimation(self, b"pos", self)
+
+        self.fade_anim = QPropertyAnimation(self, b"windowOpacity", self)
+        self.fade_anim.setDuration(self.SLIDE_OUT_DURATION); self.fade_anim.setStartValue(1.0)
+        self.fade_anim.setEndValue(0.0); self.fade_anim.setEasingCurve(QEasingCurve.InQuad)
+        self.fade_anim.finished.connect(functools.partial(self.monitor.close_popup, self))
+
     def slide_out(self):
-        """执行滑出动画。"""
+        """执行滑出动画 (位移与淡出同时开始、时长相同，淡出结束时关闭弹窗)。"""
         if hasattr(self, 'lifecycle_timer'): self.lifecycle_timer.stop()
         if hasattr(self, 'is_sliding_out') and self.is_sliding_out: return
         self.is_sliding_out = True
 
-        try:
-            if hasattr(self, 'slide_anim') and self.slide_anim.state() == QPropertyAnimation.Running:
-                self.slide_anim.stop()
-        except (RuntimeError, AttributeError):
-            pass
-
-        self.anim_group = QParallelAnimationGroup(self)
-        opacity_anim = QPropertyAnimation(self, b"windowOpacity")
-        opacity_anim.setDuration(self.SLIDE_OUT_DURATION); opacity_anim.setStartValue(1.0)
-        opacity_anim.setEndValue(0.0); opacity_anim.setEasingCurve(QEasingCurve.InQuad)
-
-        pos_anim = QPropertyAnimation(self, b"pos")
-        pos_anim.setDuration(self.SLIDE_OUT_DURATION); pos_anim.setStartValue(self.pos())
-        pos_anim.setEndValue(QPoint(self.x() - 80, self.y())); pos_anim.setEasingCurve(QEasingCurve.OutQuad)
+        self.slide_anim.stop()
+        self.slide_anim.setDuration(self.SLIDE_OUT_DURATION); self.slide_anim.setStartValue(self.pos())
+        self.slide_anim.setEndValue(QPoint(self.x() - 80, self.y())); self.slide_anim.setEasingCurve(QEasingCurve.OutQuad)
 
-        self.anim_group.addAnimation(opacity_anim)
-        self.anim_group.addAnimation(pos_anim)
-        self.anim_group.finished.connect(lambda: self.monitor.close_popup(self))
-        self.anim_group.start(QAbstractAnimation.DeleteWhenStopped)
+        self.slide_anim.start()
+        self.fade_anim.start()
 
     def move_to_initial_position(self):
         """将窗口移动到当前屏幕的右侧外部。"""
@@ -422,20 +916,37 @@ class TransparentPopup(QWidget):
     def slide_in(self):
         """动画化弹窗从当前屏幕的右侧滑入。"""
         end_pos = QPoint(self.target_screen_geom.right() - self.width() - 40, self.y())
-        self.slide_anim = QPropertyAnimation(self, b"pos")
         self.slide_anim.setDuration(self.SLIDE_IN_DURATION)
         self.slide_anim.setStartValue(self.pos()); self.slide_anim.setEndValue(end_pos)
-        self.slide_anim.start(QPropertyAnimation.DeleteWhenStopped)
+        self.slide_anim.start()
 
     def update_bottom_text(self, text):
         self.bottom_message_label.setText(text)
 
     def paintEvent(self, event):
-        """绘制弹窗背景和虚线边框。"""
-        painter = QPainter(self); painter.setRenderHint(QPainter.Antialiasing)
-        painter.fillRect(self.rect(), self.background_color)
-        pen = QPen(self.border_color, 1, Qt.DashLine); painter.setPen(pen)
-        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        """绘制弹窗背景和虚线边框 (首次绘制时渲染到缓存 QPixmap，之后只需贴图)。"""
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.get_background_pixmap())
+
+    def get_background_pixmap(self):
+        """
+        返回背景与虚线边框的缓存图像。弹窗尺寸固定，
+        因此按 (配色, 设备像素比) 在所有弹窗之间共享，滑入/滑出动画中的重绘不再重复填充和描边。
+        """
+        device_pixel_ratio = self.devicePixelRatioF()
+        cache_key = (self.color_mode, device_pixel_ratio)
+        pixmap = self._background_cache.get(cache_key)
+        if pixmap is None:
+            pixmap = QPixmap(self.size() * device_pixel_ratio)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap); painter.setRenderHint(QPainter.Antialiasing)
+            painter.fillRect(self.rect(), self.background_color)
+            painter.setPen(self.border_pen)
+            painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+            painter.end()
+            self._background_cache[cache_key] = pixmap
+        return pixmap
 
 if __name__ == "__main__":
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -443,17 +954,20 @@ if __name__ == "__main__":
 
     app = ClipboardMonitor(sys.argv)
 
-    print("="*20 + " 系统可用字体家族名列表 " + "="*20)
-    print(" (这些是您可以复制并粘贴到代码中的名字) ")
-    db = QFontDatabase()
-    verified_families = set()
-    for name in db.families():
-        font = QFont(name)
-        verified_families.add(font.family())
-    print(sorted(list(verified_families)))
-    print("="*63)
+    # 字体列表仅用于调试，需要时使用 --list-fonts 参数或设置环境变量 KOPY_LIST_FONTS=1 开启
+    if "--list-fonts" in sys.argv or os.environ.get("KOPY_LIST_FONTS"):
+        print("="*20 + " 系统可用字体家族名列表 " + "="*20)
+        print(" (这些是您可以复制并粘贴到代码中的名字) ")
+        print(sorted(QFontDatabase().families()))
+        print("="*63)
 
+    # SIGINT 处理: Python 的 C 层信号处理器写入 wakeup fd 唤醒 Qt 事件循环，
+    # 随后 Python 层的处理器得以执行，无需 50ms 的空转定时器轮询
     signal.signal(signal.SIGINT, lambda sig, frame: QApplication.quit())
-    timer = QTimer(); timer.start(50); timer.timeout.connect(lambda: None)
+    wakeup_rsock, wakeup_wsock = socket.socketpair()
+    wakeup_rsock.setblocking(False); wakeup_wsock.setblocking(False)
+    signal.set_wakeup_fd(wakeup_wsock.fileno())
+    wakeup_notifier = QSocketNotifier(wakeup_rsock.fileno(), QSocketNotifier.Read)
+    wakeup_notifier.activated.connect(lambda _: wakeup_rsock.recv(64))
 
     sys.exit(app.exec_())